@@ -9,11 +9,27 @@ __version__ = "1.0.0"
 __author__ = "Manus AI"
 __email__ = "support@manus.ai"
 
-from .discovery import DiscoveryEngine
-from .conversion import ConversionEngine
-from .modules import ModuleGenerator
-from .imports import ImportManager
-from .orchestrator import Orchestrator
+import importlib
+
+# Public classes and the submodules defining them; each is imported on first
+# access, so importing a single submodule does not pull in boto3
+_LAZY_IMPORTS = {
+    "DiscoveryEngine": ".discovery",
+    "ConversionEngine": ".conversion",
+    "ModuleGenerator": ".modules",
+    "ImportManager": ".imports",
+    "Orchestrator": ".orchestrator"
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "DiscoveryEngine",
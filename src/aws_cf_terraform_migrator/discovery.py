@@ -10,7 +10,7 @@ discovery to ensure complete infrastructure coverage.
 import boto3
 import json
 import logging
-from typing import Dict, List, Optional, Set, Any, Tuple
+from typing import Dict, List, Optional, Set, Any, Tuple, Union, IO
 from dataclasses import dataclass, field
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from botocore.exceptions import ClientError, NoCredentialsError
@@ -658,10 +658,23 @@ class DiscoveryEngine:
             'regions_scanned': self.regions
         }
     
-    def export_discovery_results(self, output_file: str):
-        """Export discovery results to JSON file"""
-        logger.info(f"Exporting discovery results to {output_file}")
-        
+    def export_discovery_results(self, output_file: Union[str, IO[str]]):
+        """Export discovery results to a JSON file path or writable text stream"""
+        is_stream = hasattr(output_file, 'write')
+        destination = getattr(output_file, 'name', 'text stream') if is_stream else output_file
+        logger.info(f"Exporting discovery results to {destination}")
+        
+        export_data = self.get_discovery_export_data()
+        if is_stream:
+            json.dump(export_data, output_file, indent=2, default=str)
+        else:
+            with open(output_file, 'w') as f:
+                json.dump(export_data, f, indent=2, default=str)
+        
+        logger.info(f"Discovery results exported to {destination}")
+    
+    def get_discovery_export_data(self) -> Dict[str, Any]:
+        """Build the JSON-serializable discovery results written by export_discovery_results"""
         # Convert dataclasses to dictionaries for JSON serialization
         stacks_dict = {}
         for stack_id, stack_info in self.stacks.items():
@@ -709,10 +722,7 @@ class DiscoveryEngine:
             'stack_hierarchy': self.stack_hierarchy
         }
         
-        with open(output_file, 'w') as f:
-            json.dump(export_data, f, indent=2, default=str)
-        
-        logger.info(f"Discovery results exported to {output_file}")
+        return export_data
 
 
 if __name__ == "__main__":
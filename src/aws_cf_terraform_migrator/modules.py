@@ -8,6 +8,7 @@ strategies and best practices.
 """
 
 import os
+import copy
 import json
 import logging
 from typing import Dict, List, Optional, Any, Set, Tuple
@@ -15,6 +16,7 @@ from dataclasses import dataclass, field
 from pathlib import Path
 import re
 from collections import defaultdict
+from functools import lru_cache
 import yaml
 from jinja2 import Template
 
@@ -57,6 +59,7 @@ class ModuleOrganizer:
         """
         self.strategy = strategy
         self.service_groups = self._define_service_groups()
+        self.type_to_group = self._build_type_to_group(self.service_groups)
         
     def _define_service_groups(self) -> Dict[str, List[str]]:
         """Define logical service groups for resource organization"""
@@ -119,6 +122,29 @@ class ModuleOrganizer:
             ]
         }
     
+    def with_strategy(self, strategy: str) -> 'ModuleOrganizer':
+        """
+        Return an organizer for another strategy that shares this one's lookup tables
+        
+        Args:
+            strategy: Organization strategy for the returned organizer
+            
+        Returns:
+            A new ModuleOrganizer; this organizer is left unchanged
+        """
+        organizer = copy.copy(self)
+        organizer.strategy = strategy
+        return organizer
+    
+    @staticmethod
+    def _build_type_to_group(service_groups: Dict[str, List[str]]) -> Dict[str, str]:
+        """Map each resource type to the first service group that lists it"""
+        type_to_group = {}
+        for group_name, resource_types in service_groups.items():
+            for resource_type in resource_types:
+                type_to_group.setdefault(resource_type, group_name)
+        return type_to_group
+    
     def organize_resources(self, resources: Dict[str, Any], 
                           stacks: Dict[str, Any] = None) -> Dict[str, List[str]]:
         """
@@ -150,11 +176,7 @@ class ModuleOrganizer:
             resource_type = resource_info.get('resource_type', '')
             
             # Find the service group for this resource type
-            service_group = None
-            for group_name, resource_types in self.service_groups.items():
-                if resource_type in resource_types:
-                    service_group = group_name
-                    break
+            service_group = self.type_to_group.get(resource_type)
             
             # If no specific group found, use generic service name
             if not service_group:
@@ -246,20 +268,32 @@ class ModuleOrganizer:
     
     def _sanitize_module_name(self, name: str) -> str:
         """Sanitize a name to be a valid Terraform module name"""
-        # Convert to lowercase and replace invalid characters
-        sanitized = re.sub(r'[^a-z0-9_-]', '_', name.lower())
-        
-        # Remove duplicate underscores
-        sanitized = re.sub(r'_+', '_', sanitized)
-        
-        # Remove leading/trailing underscores and hyphens
-        sanitized = sanitized.strip('_-')
-        
-        # Ensure it starts with a letter
-        if sanitized and not sanitized[0].isalpha():
-            sanitized = f"module_{sanitized}"
-        
-        return sanitized or "unnamed_module"
+        return _sanitize_module_name(name)
+
+
+@lru_cache(maxsize=256)
+def _sanitize_module_name(name: str) -> str:
+    """Sanitize a name to be a valid Terraform module name, memoized per name"""
+    # Convert to lowercase and replace invalid characters
+    sanitized = re.sub(r'[^a-z0-9_-]', '_', name.lower())
+    
+    # Remove duplicate underscores
+    sanitized = re.sub(r'_+', '_', sanitized)
+    
+    # Remove leading/trailing underscores and hyphens
+    sanitized = sanitized.strip('_-')
+    
+    # Ensure it starts with a letter
+    if sanitized and not sanitized[0].isalpha():
+        sanitized = f"module_{sanitized}"
+    
+    return sanitized or "unnamed_module"
+
+
+@lru_cache(maxsize=64)
+def _compile_template(source: str) -> Template:
+    """Compile a jinja template, memoized on its source so overrides compile separately"""
+    return Template(source)
 
 
 class ModuleGenerator:
@@ -451,6 +485,16 @@ This module was generated from the following CloudFormation resources:
         
         logger.info(f"Initialized ModuleGenerator with {organization_strategy} strategy")
     
+    def _get_template(self, name: str) -> Template:
+        """Return the compiled template for this generator's named template attribute"""
+        return _compile_template(getattr(self, name))
+    
+    def _warm_templates(self):
+        """Compile every module file template ahead of the first generation run"""
+        for name in ('MAIN_TF_TEMPLATE', 'VARIABLES_TF_TEMPLATE', 'OUTPUTS_TF_TEMPLATE',
+                     'VERSIONS_TF_TEMPLATE', 'README_TEMPLATE'):
+            self._get_template(name)
+    
     def generate_modules(self, 
                         converted_resources: Dict[str, Any],
                         discovery_resources: Dict[str, Any],
@@ -652,7 +696,6 @@ This module was generated from the following CloudFormation resources:
         # Common variables based on resource types
         has_ec2 = any('aws_instance' in res_type for res_type in module_resources.keys())
         has_rds = any('aws_db_instance' in res_type for res_type in module_resources.keys())
-        has_s3 = any('aws_s3_bucket' in res_type for res_type in module_resources.keys())
         
         # Add common variables
         if has_ec2 or has_rds:
@@ -703,7 +746,7 @@ This module was generated from the following CloudFormation resources:
                       resources: Dict[str, Any], locals_dict: Dict[str, Any]):
         """Write main.tf file for a module"""
         
-        template = Template(self.MAIN_TF_TEMPLATE)
+        template = self._get_template('MAIN_TF_TEMPLATE')
         content = template.render(
             module_description=f"Terraform module for {module_name} resources",
             terraform_version=self.terraform_version,
@@ -719,7 +762,7 @@ This module was generated from the following CloudFormation resources:
                            variables: Dict[str, Any]):
         """Write variables.tf file for a module"""
         
-        template = Template(self.VARIABLES_TF_TEMPLATE)
+        template = self._get_template('VARIABLES_TF_TEMPLATE')
         content = template.render(
             module_name=module_name,
             variables=variables
@@ -732,7 +775,7 @@ This module was generated from the following CloudFormation resources:
                          outputs: Dict[str, Any]):
         """Write outputs.tf file for a module"""
         
-        template = Template(self.OUTPUTS_TF_TEMPLATE)
+        template = self._get_template('OUTPUTS_TF_TEMPLATE')
         content = template.render(
             module_name=module_name,
             outputs=outputs
@@ -744,7 +787,7 @@ This module was generated from the following CloudFormation resources:
     def _write_versions_tf(self, module_dir: Path, module_name: str):
         """Write versions.tf file for a module"""
         
-        template = Template(self.VERSIONS_TF_TEMPLATE)
+        template = self._get_template('VERSIONS_TF_TEMPLATE')
         content = template.render(
             module_name=module_name,
             terraform_version=self.terraform_version,
@@ -759,7 +802,7 @@ This module was generated from the following CloudFormation resources:
                         outputs: Dict[str, Any], original_resources: List[str]):
         """Write README.md file for a module"""
         
-        template = Template(self.README_TEMPLATE)
+        template = self._get_template('README_TEMPLATE')
         content = template.render(
             module_name=module_name,
             module_description=f"This module manages {module_name} resources converted from CloudFormation.",
@@ -22,6 +22,22 @@ from .imports import ImportManager
 logger = logging.getLogger(__name__)
 
 
+class OutputWriter:
+    """
+    Writes the files the orchestrator produces itself
+    
+    Only the discovery export, modules_metadata.json, the conversion report
+    and the migration guide go through this class. ModuleGenerator and
+    ImportManager still write module, import-script and backup files with
+    open() into the output directory.
+    """
+    
+    def write_text(self, path: str, content: str):
+        """Write content to the file at path"""
+        with open(path, 'w') as f:
+            f.write(content)
+
+
 class Orchestrator:
     """
     Main orchestration controller
@@ -30,29 +46,38 @@ class Orchestrator:
     conversion, module generation, and import script creation.
     """
     
-    def __init__(self, config: ToolConfig):
+    def __init__(self, config: ToolConfig,
+                 discovery_engine: Optional[DiscoveryEngine] = None,
+                 conversion_engine: Optional[ConversionEngine] = None,
+                 module_generator: Optional[ModuleGenerator] = None,
+                 output_writer: Optional[OutputWriter] = None):
         """
         Initialize the orchestrator
         
         Args:
             config: Tool configuration object
+            discovery_engine: Pre-built discovery engine (built from config if None)
+            conversion_engine: Pre-built conversion engine (built from config if None)
+            module_generator: Pre-built module generator (built from config if None)
+            output_writer: Writer for the orchestrator's report, metadata and export files (disk if None)
         """
         self.config = config
+        self.output_writer = output_writer or OutputWriter()
         
         # Initialize components
-        self.discovery_engine = DiscoveryEngine(
+        self.discovery_engine = discovery_engine or DiscoveryEngine(
             regions=config.discovery.regions,
             profile=config.discovery.profile,
             role_arn=config.discovery.role_arn,
             max_workers=config.discovery.max_workers
         )
         
-        self.conversion_engine = ConversionEngine(
+        self.conversion_engine = conversion_engine or ConversionEngine(
             preserve_names=config.conversion.preserve_original_names,
             handle_functions=config.conversion.handle_intrinsic_functions
         )
         
-        self.module_generator = ModuleGenerator(
+        self.module_generator = module_generator or ModuleGenerator(
             organization_strategy=config.modules.organization_strategy,
             module_prefix=config.modules.module_prefix,
             include_examples=config.modules.include_examples,
@@ -211,7 +236,10 @@ class Orchestrator:
                     self.config.output.output_directory,
                     f"discovery_results.{self.config.output.export_format}"
                 )
-                self.discovery_engine.export_discovery_results(discovery_file)
+                self.output_writer.write_text(
+                    discovery_file,
+                    json.dumps(self.discovery_engine.get_discovery_export_data(), indent=2, default=str)
+                )
                 logger.info(f"Discovery data exported to {discovery_file}")
             
         except Exception as e:
@@ -375,8 +403,9 @@ class Orchestrator:
                 }
                 
                 metadata_file = output_dir / "modules_metadata.json"
-                with open(metadata_file, 'w') as f:
-                    json.dump(modules_info, f, indent=2, default=str)
+                self.output_writer.write_text(
+                    str(metadata_file), json.dumps(modules_info, indent=2, default=str)
+                )
                 
                 logger.info(f"Module metadata exported to {metadata_file}")
             
@@ -462,16 +491,12 @@ class Orchestrator:
             # Generate conversion report
             report_content = self._generate_conversion_report(conversion_result)
             report_file = output_dir / "conversion_report.md"
-            
-            with open(report_file, 'w') as f:
-                f.write(report_content)
+            self.output_writer.write_text(str(report_file), report_content)
             
             # Generate migration guide
             migration_guide = self._generate_migration_guide(conversion_result)
             guide_file = output_dir / "MIGRATION_GUIDE.md"
-            
-            with open(guide_file, 'w') as f:
-                f.write(migration_guide)
+            self.output_writer.write_text(str(guide_file), migration_guide)
             
             phase_result.update({
                 'success': True,
@@ -0,0 +1,29 @@
+"""
+Shared pytest configuration for the CF2TF converter tests
+
+The suite can run in parallel with pytest-xdist, e.g.
+``PYTHONHASHSEED=0 python -m pytest -n auto --dist=loadscope test/unit``;
+loadscope keeps each TestCase class, and so its setUpClass engines, on a
+single worker, and the fixed hash seed makes hash-ordered collections iterate
+identically in every worker.
+"""
+
+# Imported once here so each xdist worker pays boto3's import cost up front
+import boto3  # noqa: F401
+import pytest
+
+from test.fixtures.sample_cloudformation_templates import (
+    ALL_TEMPLATES, _template_validator, get_template
+)
+
+
+@pytest.fixture(scope="session")
+def template_validator():
+    """Fixture template validator, compiled on first use and shared for the session"""
+    return _template_validator()
+
+
+@pytest.fixture(params=list(ALL_TEMPLATES))
+def cf_template(request):
+    """Parametrized fixture that builds only the template under test"""
+    return get_template(request.param)
@@ -0,0 +1,288 @@
+"""
+Shared fixtures for the end-to-end integration tests
+"""
+
+import sys
+import os
+from dataclasses import replace
+from types import MappingProxyType, SimpleNamespace
+from unittest.mock import Mock, MagicMock
+
+import boto3
+import pytest
+
+# Add src directory to path, once per process
+_SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
+
+from aws_cf_terraform_migrator.orchestrator import Orchestrator, OutputWriter
+from aws_cf_terraform_migrator.conversion import ConversionEngine
+from aws_cf_terraform_migrator.modules import ModuleGenerator
+from aws_cf_terraform_migrator.config import ToolConfig, DiscoveryConfig, ConversionConfig, ModuleConfig, OutputConfig, ImportConfig
+
+
+@pytest.fixture(scope="module")
+def tool_config_template():
+    """
+    ToolConfig sections shared by every test; modules and output are set per test
+    
+    Documentation and backups are off so tests write only the files they
+    assert on; use config_with_docs for the ones that need them.
+    """
+    return MappingProxyType({
+        'discovery': DiscoveryConfig(
+            regions=['us-east-1'],
+            profile=None,
+            role_arn=None,
+            max_workers=2,
+            include_deleted_stacks=False,
+            stack_name_filter=None
+        ),
+        'conversion': ConversionConfig(
+            preserve_original_names=True,
+            handle_intrinsic_functions=True,
+            terraform_version='>=1.0',
+            provider_version='>=5.0'
+        ),
+        'imports': ImportConfig(
+            parallel_imports=False,
+            max_import_workers=3,
+            import_timeout=300,
+            retry_failed_imports=True,
+            max_retries=2,
+            create_backup=False
+        )
+    })
+
+
+# Per-module file emission switches, selected through modules_config
+MODULE_VARIANTS = {
+    'minimal': dict(include_examples=False, include_readme=False, include_versions_tf=False),
+    'full': dict(include_examples=True, include_readme=True, include_versions_tf=True)
+}
+
+
+@pytest.fixture
+def modules_config(request):
+    """
+    Module generation settings, 'minimal' unless parametrized indirectly
+    
+    Tests that read examples, READMEs or versions.tf request the 'full'
+    variant with indirect parametrization of modules_config.
+    """
+    variant = getattr(request, 'param', 'minimal')
+    return ModuleConfig(
+        organization_strategy='service_based',
+        module_prefix='',
+        **MODULE_VARIANTS[variant]
+    )
+
+
+# Output directory for dry runs whose report, metadata and export files are
+# captured by InMemoryOutputWriter; dry runs never create it on disk
+IN_MEMORY_OUTPUT_DIR = '/in-memory/output'
+
+
+def _output_config(output_directory):
+    """Output settings shared by every test, writing into output_directory"""
+    return OutputConfig(
+        output_directory=output_directory,
+        export_discovery_data=True,
+        export_format='json',
+        generate_documentation=False,
+        include_metadata=True
+    )
+
+
+@pytest.fixture
+def config(tmp_path, tool_config_template, modules_config):
+    """Tool configuration writing into the test's own temporary directory"""
+    return ToolConfig(
+        **tool_config_template,
+        modules=modules_config,
+        output=_output_config(str(tmp_path))
+    )
+
+
+@pytest.fixture
+def in_memory_config(tool_config_template, modules_config):
+    """Tool configuration for dry runs whose output goes to output_writer"""
+    return ToolConfig(
+        **tool_config_template,
+        modules=modules_config,
+        output=_output_config(IN_MEMORY_OUTPUT_DIR)
+    )
+
+
+class InMemoryOutputWriter(OutputWriter):
+    """OutputWriter that keeps written files in a dict keyed by path"""
+    
+    def __init__(self):
+        self.files = {}
+    
+    def write_text(self, path, content):
+        self.files[str(path)] = content
+
+
+@pytest.fixture
+def output_writer():
+    """Capture the orchestrator's report, metadata and export files in memory"""
+    return InMemoryOutputWriter()
+
+
+@pytest.fixture
+def config_with_docs(config):
+    """Tool configuration that also writes reports and backups"""
+    return replace(
+        config,
+        output=replace(config.output, generate_documentation=True),
+        imports=replace(config.imports, create_backup=True)
+    )
+
+
+class _PaginatorStub:
+    """Single-page paginator over a stub client operation"""
+    
+    def __init__(self, client, operation):
+        self.client = client
+        self.operation = operation
+    
+    def paginate(self, **kwargs):
+        return [getattr(self.client, self.operation)(**kwargs)]
+
+
+class _ClientStub:
+    """Base for hand-written boto3 client stubs returning preset responses"""
+    
+    def __init__(self, **responses):
+        self.responses = responses
+    
+    def get_paginator(self, operation):
+        return _PaginatorStub(self, operation)
+
+
+class _CFStub(_ClientStub):
+    """CloudFormation client stub"""
+    
+    def list_stacks(self, **kwargs):
+        return self.responses['list_stacks']
+    
+    def describe_stacks(self, **kwargs):
+        return self.responses['describe_stacks']
+    
+    def describe_stack_resources(self, **kwargs):
+        return self.responses['describe_stack_resources']
+    
+    def get_template(self, **kwargs):
+        return self.responses['get_template']
+
+
+class _EC2Stub(_ClientStub):
+    """EC2 client stub"""
+    
+    def describe_vpcs(self, **kwargs):
+        return self.responses['describe_vpcs']
+    
+    def describe_instances(self, **kwargs):
+        return self.responses['describe_instances']
+    
+    def describe_subnets(self, **kwargs):
+        return self.responses['describe_subnets']
+    
+    def describe_security_groups(self, **kwargs):
+        return self.responses['describe_security_groups']
+
+
+@pytest.fixture(scope="module")
+def _boto3_session_class():
+    """Stand-in for boto3.Session, specced once per module and reset per test"""
+    session = MagicMock(spec=boto3.session.Session)
+    return MagicMock(spec=boto3.session.Session, return_value=session)
+
+
+@pytest.fixture
+def aws_mocks(monkeypatch, _boto3_session_class):
+    """
+    Patch boto3.Session with stubbed CloudFormation and EC2 clients
+    
+    Both clients start out describing an empty account; tests override only
+    the responses they care about, e.g. aws_mocks.cf.responses['list_stacks'],
+    or replace a client in aws_mocks.clients when they need Mock side effects.
+    """
+    cf = _CFStub(
+        list_stacks={'StackSummaries': []}
+    )
+    
+    ec2 = _EC2Stub(
+        describe_vpcs={'Vpcs': []},
+        describe_instances={'Reservations': []},
+        describe_subnets={'Subnets': []},
+        describe_security_groups={'SecurityGroups': []}
+    )
+    
+    clients = {'cloudformation': cf, 'ec2': ec2}
+    
+    def client_factory(service, region_name=None):
+        if service in clients:
+            return clients[service]
+        return Mock()
+    
+    _boto3_session_class.reset_mock()
+    session = _boto3_session_class.return_value
+    session.client.side_effect = client_factory
+    monkeypatch.setattr('boto3.Session', _boto3_session_class)
+    
+    return SimpleNamespace(cf=cf, ec2=ec2, clients=clients, session=session)
+
+
+@pytest.fixture(scope="session")
+def conversion_engine():
+    """Default ConversionEngine shared by the whole session; it keeps no per-run state"""
+    return ConversionEngine()
+
+
+@pytest.fixture(scope="session")
+def orchestrator_factory():
+    """
+    Build Orchestrators that reuse conversion engines and module generators
+    
+    Both components are stateless between runs, so one instance per distinct
+    set of constructor arguments is shared for the whole session. The
+    discovery engine is always built fresh because it opens a boto3 session,
+    which the aws_mocks fixture patches per test.
+    """
+    conversion_engines = {}
+    module_generators = {}
+    
+    def make_orchestrator(config, output_writer=None):
+        conversion_key = (
+            config.conversion.preserve_original_names,
+            config.conversion.handle_intrinsic_functions
+        )
+        if conversion_key not in conversion_engines:
+            conversion_engines[conversion_key] = ConversionEngine(
+                preserve_names=conversion_key[0],
+                handle_functions=conversion_key[1]
+            )
+        
+        module_key = (
+            config.modules.organization_strategy,
+            config.modules.module_prefix,
+            config.modules.include_examples,
+            config.modules.include_readme,
+            config.modules.include_versions_tf,
+            config.conversion.terraform_version,
+            config.conversion.provider_version
+        )
+        if module_key not in module_generators:
+            module_generators[module_key] = ModuleGenerator(*module_key)
+        
+        return Orchestrator(
+            config,
+            conversion_engine=conversion_engines[conversion_key],
+            module_generator=module_generators[module_key],
+            output_writer=output_writer
+        )
+    
+    return make_orchestrator
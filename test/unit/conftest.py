@@ -0,0 +1,20 @@
+"""
+Shared pytest fixtures for the unit tests
+"""
+
+from unittest.mock import MagicMock, Mock
+
+import pytest
+
+
+@pytest.fixture
+def mock_boto3_session(monkeypatch):
+    """
+    Patch boto3.Session for discovery and return the session it hands out
+    
+    Tests configure clients on the returned session, e.g.
+    ``mock_boto3_session.client.return_value`` or ``.client.side_effect``.
+    """
+    session = MagicMock()
+    monkeypatch.setattr('aws_cf_terraform_migrator.discovery.boto3.Session', Mock(return_value=session))
+    return session
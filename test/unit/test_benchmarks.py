@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Performance guards for the module organizer
+
+Run with ``python -m pytest --benchmark-only test/unit/test_benchmarks.py``;
+the benchmarks are skipped in ordinary test runs.
+"""
+
+import sys
+import os
+import itertools
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src'))
+
+from aws_cf_terraform_migrator.modules import ModuleOrganizer
+
+
+RESOURCE_TYPES = [
+    'AWS::EC2::VPC', 'AWS::EC2::Subnet', 'AWS::EC2::SecurityGroup', 'AWS::IAM::Role',
+    'AWS::Lambda::Function', 'AWS::S3::Bucket', 'AWS::RDS::DBInstance',
+    'AWS::SNS::Topic', 'AWS::Custom::Thing'
+]
+
+# Generous upper bound on the mean time to organize 10k resources, in seconds
+ORGANIZE_MEAN_LIMIT = 0.5
+
+
+@pytest.fixture(scope="module")
+def large_resources():
+    """10k resources spread over grouped and ungrouped types and 50 stacks"""
+    types = itertools.cycle(RESOURCE_TYPES)
+    return {
+        f'r-{i}': {
+            'resource_type': next(types),
+            'resource_id': f'r-{i}',
+            'stack_name': f'stack-{i % 50}'
+        }
+        for i in range(10000)
+    }
+
+
+@pytest.mark.parametrize("strategy", ["service_based", "stack_based", "lifecycle_based", "hybrid"])
+def test_benchmark_organize_resources(benchmark, request, large_resources, strategy):
+    """Test that organize_resources stays fast on 10k resources"""
+    if not request.config.getoption("benchmark_only"):
+        pytest.skip("benchmarks run only with --benchmark-only")
+    
+    organizer = ModuleOrganizer(strategy=strategy)
+    modules = benchmark(organizer.organize_resources, large_resources)
+    
+    assert sum(len(resource_ids) for resource_ids in modules.values()) == len(large_resources)
+    assert benchmark.stats.stats.mean < ORGANIZE_MEAN_LIMIT
@@ -8,6 +8,8 @@ import sys
 import os
 from unittest.mock import Mock, patch, MagicMock
 
+import pytest
+
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src'))
 
@@ -18,28 +20,9 @@ from test.fixtures.sample_cloudformation_templates import SIMPLE_VPC_TEMPLATE, S
 class TestResourceMapper(unittest.TestCase):
     """Test the ResourceMapper class"""
     
-    def setUp(self):
-        self.mapper = ResourceMapper()
-    
-    def test_get_terraform_type_vpc(self):
-        """Test VPC resource type mapping"""
-        tf_type = self.mapper.get_terraform_type('AWS::EC2::VPC')
-        self.assertEqual(tf_type, 'aws_vpc')
-    
-    def test_get_terraform_type_s3(self):
-        """Test S3 bucket resource type mapping"""
-        tf_type = self.mapper.get_terraform_type('AWS::S3::Bucket')
-        self.assertEqual(tf_type, 'aws_s3_bucket')
-    
-    def test_get_terraform_type_lambda(self):
-        """Test Lambda function resource type mapping"""
-        tf_type = self.mapper.get_terraform_type('AWS::Lambda::Function')
-        self.assertEqual(tf_type, 'aws_lambda_function')
-    
-    def test_get_terraform_type_unknown(self):
-        """Test unknown resource type"""
-        tf_type = self.mapper.get_terraform_type('AWS::Unknown::Resource')
-        self.assertIsNone(tf_type)
+    @classmethod
+    def setUpClass(cls):
+        cls.mapper = ResourceMapper()
     
     def test_convert_vpc_properties(self):
         """Test VPC properties conversion"""
@@ -120,15 +103,39 @@ class TestResourceMapper(unittest.TestCase):
         self.assertEqual(tf_tags, {})
 
 
+@pytest.fixture(scope='module')
+def mapper():
+    """ResourceMapper shared by the module's parametrized tests"""
+    return ResourceMapper()
+
+
+@pytest.mark.parametrize('cf_type, tf_type', [
+    ('AWS::EC2::VPC', 'aws_vpc'),
+    ('AWS::S3::Bucket', 'aws_s3_bucket'),
+    ('AWS::Lambda::Function', 'aws_lambda_function'),
+    ('AWS::Unknown::Resource', None),
+])
+def test_get_terraform_type(mapper, cf_type, tf_type):
+    """Test CloudFormation to Terraform resource type mapping"""
+    assert mapper.get_terraform_type(cf_type) == tf_type
+
+
 class TestConversionEngine(unittest.TestCase):
     """Test the ConversionEngine class"""
     
-    def setUp(self):
-        self.engine = ConversionEngine()
+    @classmethod
+    def setUpClass(cls):
+        cls.engine = ConversionEngine()
+        cls.name_preserving_engine = ConversionEngine(preserve_names=True)
+        
+        # Conversion does not mutate its input, so each fixture template is
+        # converted once and the tests assert on different parts of the result
+        cls.simple_result = cls.engine.convert_template(SIMPLE_VPC_TEMPLATE)
+        cls.s3_lambda_result = cls.engine.convert_template(S3_LAMBDA_TEMPLATE)
     
     def test_convert_simple_vpc_template(self):
         """Test conversion of simple VPC template"""
-        result = self.engine.convert_template(SIMPLE_VPC_TEMPLATE)
+        result = self.simple_result
         
         self.assertIsInstance(result, ConversionResult)
         self.assertIn('resource', result.terraform_config)
@@ -146,7 +153,7 @@ class TestConversionEngine(unittest.TestCase):
     
     def test_convert_template_with_parameters(self):
         """Test conversion of template with parameters"""
-        result = self.engine.convert_template(SIMPLE_VPC_TEMPLATE)
+        result = self.simple_result
         
         variables = result.terraform_config.get('variable', {})
         self.assertIn('VpcCidr', variables)
@@ -158,7 +165,7 @@ class TestConversionEngine(unittest.TestCase):
     
     def test_convert_template_with_outputs(self):
         """Test conversion of template with outputs"""
-        result = self.engine.convert_template(SIMPLE_VPC_TEMPLATE)
+        result = self.simple_result
         
         outputs = result.terraform_config.get('output', {})
         self.assertIn('VpcId', outputs)
@@ -170,7 +177,7 @@ class TestConversionEngine(unittest.TestCase):
     
     def test_convert_template_with_intrinsic_functions(self):
         """Test conversion of template with CloudFormation intrinsic functions"""
-        result = self.engine.convert_template(SIMPLE_VPC_TEMPLATE)
+        result = self.simple_result
         
         # Check that Ref functions are converted
         resources = result.terraform_config['resource']
@@ -183,7 +190,7 @@ class TestConversionEngine(unittest.TestCase):
     
     def test_convert_s3_lambda_template(self):
         """Test conversion of S3 and Lambda template"""
-        result = self.engine.convert_template(S3_LAMBDA_TEMPLATE)
+        result = self.s3_lambda_result
         
         resources = result.terraform_config['resource']
         
@@ -235,7 +242,7 @@ class TestConversionEngine(unittest.TestCase):
     
     def test_preserve_original_names(self):
         """Test preservation of original resource names"""
-        engine = ConversionEngine(preserve_names=True)
+        engine = self.name_preserving_engine
         
         cf_resource = {
             'Type': 'AWS::EC2::VPC',
@@ -254,7 +261,7 @@ class TestConversionEngine(unittest.TestCase):
     
     def test_generate_import_commands(self):
         """Test generation of import commands"""
-        result = self.engine.convert_template(SIMPLE_VPC_TEMPLATE)
+        result = self.simple_result
         
         self.assertTrue(len(result.import_commands) > 0)
         
@@ -285,8 +292,9 @@ class TestConversionEngine(unittest.TestCase):
 class TestIntrinsicFunctions(unittest.TestCase):
     """Test CloudFormation intrinsic function handling"""
     
-    def setUp(self):
-        self.engine = ConversionEngine(handle_functions=True)
+    @classmethod
+    def setUpClass(cls):
+        cls.engine = ConversionEngine(handle_functions=True)
     
     def test_ref_function(self):
         """Test Ref function conversion"""
@@ -347,6 +355,14 @@ class TestIntrinsicFunctions(unittest.TestCase):
         self.assertIsInstance(tf_value, str)
 
 
+def test_convert_fixture_template(cf_template):
+    """Test that every fixture template converts without errors"""
+    result = ConversionEngine().convert_template(cf_template)
+    
+    assert 'resource' in result.terraform_config
+    assert not result.errors
+
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -6,13 +6,16 @@ Unit tests for the discovery engine
 import unittest
 import sys
 import os
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, MagicMock
 from datetime import datetime
 
+import pytest
+
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src'))
 
 from aws_cf_terraform_migrator.discovery import DiscoveryEngine, StackInfo, ResourceInfo
+from botocore.exceptions import ClientError
 
 
 class TestStackInfo(unittest.TestCase):
@@ -89,16 +92,27 @@ class TestResourceInfo(unittest.TestCase):
 class TestDiscoveryEngine(unittest.TestCase):
     """Test the DiscoveryEngine class"""
     
-    def setUp(self):
-        """Set up test fixtures"""
-        self.engine = DiscoveryEngine(regions=['us-east-1'])
+    @classmethod
+    def setUpClass(cls):
+        """Set up test fixtures shared by the class"""
+        cls.engine = DiscoveryEngine(regions=['us-east-1'])
+    
+    @pytest.fixture(autouse=True)
+    def _inject_fixtures(self, mock_boto3_session):
+        """Give each test a mocked boto3 session"""
+        self.mock_session = mock_boto3_session
+        self.engine.session = mock_boto3_session
+    
+    def tearDown(self):
+        """Reset discovery state left on the shared engine"""
+        self.engine.stacks.clear()
+        self.engine.resources.clear()
+        self.engine.stack_hierarchy.clear()
+        vars(self.engine).pop('discovered_stacks', None)
+        vars(self.engine).pop('discovered_resources', None)
     
-    @patch('boto3.Session')
-    def test_initialization(self, mock_session):
+    def test_initialization(self):
         """Test DiscoveryEngine initialization"""
-        mock_session_instance = Mock()
-        mock_session.return_value = mock_session_instance
-        
         engine = DiscoveryEngine(
             regions=['us-east-1', 'us-west-2'],
             profile='test-profile',
@@ -109,28 +123,22 @@ class TestDiscoveryEngine(unittest.TestCase):
         self.assertEqual(engine.profile, 'test-profile')
         self.assertEqual(engine.role_arn, 'arn:aws:iam::123456789012:role/test-role')
     
-    @patch('boto3.Session')
-    def test_get_cloudformation_client(self, mock_session):
+    def test_get_cloudformation_client(self):
         """Test CloudFormation client creation"""
-        mock_session_instance = Mock()
         mock_client = Mock()
-        mock_session.return_value = mock_session_instance
-        mock_session_instance.client.return_value = mock_client
+        self.mock_session.client.return_value = mock_client
         
         engine = DiscoveryEngine(regions=['us-east-1'])
         client = engine._get_cloudformation_client('us-east-1')
         
-        mock_session_instance.client.assert_called_with('cloudformation', region_name='us-east-1')
+        self.mock_session.client.assert_called_with('cloudformation', region_name='us-east-1')
         self.assertEqual(client, mock_client)
     
-    @patch('boto3.Session')
-    def test_discover_stacks(self, mock_session):
+    def test_discover_stacks(self):
         """Test stack discovery"""
         # Mock CloudFormation client
         mock_client = Mock()
-        mock_session_instance = Mock()
-        mock_session.return_value = mock_session_instance
-        mock_session_instance.client.return_value = mock_client
+        self.mock_session.client.return_value = mock_client
         
         # Mock stack data
         mock_stacks_response = {
@@ -194,20 +202,17 @@ class TestDiscoveryEngine(unittest.TestCase):
         self.assertIn('test-stack-1', [stack.stack_name for stack in stacks.values()])
         self.assertIn('test-stack-2', [stack.stack_name for stack in stacks.values()])
     
-    @patch('boto3.Session')
-    def test_discover_independent_resources(self, mock_session):
+    def test_discover_independent_resources(self):
         """Test discovery of independent resources"""
         # Mock EC2 client
         mock_ec2_client = Mock()
-        mock_session_instance = Mock()
-        mock_session.return_value = mock_session_instance
         
         def mock_client_factory(service, region_name):
             if service == 'ec2':
                 return mock_ec2_client
             return Mock()
         
-        mock_session_instance.client.side_effect = mock_client_factory
+        self.mock_session.client.side_effect = mock_client_factory
         
         # Mock VPC data
         mock_vpcs_response = {
@@ -239,13 +244,9 @@ class TestDiscoveryEngine(unittest.TestCase):
         self.assertEqual(vpc_resources[0].resource_id, 'vpc-independent-1')
         self.assertFalse(vpc_resources[0].managed_by_cloudformation)
     
-    @patch('boto3.Session')
-    def test_discover_all(self, mock_session):
+    def test_discover_all(self):
         """Test complete discovery process"""
-        # Mock session and clients
-        mock_session_instance = Mock()
-        mock_session.return_value = mock_session_instance
-        
+        # Mock clients
         mock_cf_client = Mock()
         mock_ec2_client = Mock()
         
@@ -256,7 +257,7 @@ class TestDiscoveryEngine(unittest.TestCase):
                 return mock_ec2_client
             return Mock()
         
-        mock_session_instance.client.side_effect = mock_client_factory
+        self.mock_session.client.side_effect = mock_client_factory
         
         # Mock CloudFormation responses
         mock_cf_client.list_stacks.return_value = {'StackSummaries': []}
@@ -312,49 +313,39 @@ class TestDiscoveryEngine(unittest.TestCase):
     def test_export_discovery_results_json(self):
         """Test exporting discovery results to JSON"""
         # Create mock data
-        self.engine.discovered_stacks = {
-            'stack1': StackInfo(
-                stack_name='stack1',
-                stack_id='id1',
-                stack_status='CREATE_COMPLETE',
-                creation_time=datetime.now(),
-                region='us-east-1'
-            )
-        }
+        self.engine.stacks['id1'] = StackInfo(
+            stack_name='stack1',
+            stack_id='id1',
+            stack_status='CREATE_COMPLETE',
+            creation_time=datetime.now().isoformat()
+        )
         
-        self.engine.discovered_resources = {
-            'vpc-1': ResourceInfo(
-                resource_id='vpc-1',
-                resource_type='AWS::EC2::VPC',
-                region='us-east-1',
-                managed_by_cloudformation=True,
-                stack_name='stack1'
-            )
-        }
+        self.engine.resources['vpc-1'] = ResourceInfo(
+            resource_id='vpc-1',
+            resource_type='AWS::EC2::VPC',
+            region='us-east-1',
+            managed_by_cloudformation=True,
+            stack_name='stack1'
+        )
         
-        # Test export to temporary file
-        import tempfile
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            temp_file = f.name
-        
-        try:
-            self.engine.export_discovery_results(temp_file)
-            
-            # Verify file was created and contains data
-            self.assertTrue(os.path.exists(temp_file))
-            
-            with open(temp_file, 'r') as f:
-                import json
-                data = json.load(f)
-                
-                self.assertIn('stacks', data)
-                self.assertIn('resources', data)
-                self.assertIn('summary', data)
-        
-        finally:
-            # Clean up
-            if os.path.exists(temp_file):
-                os.unlink(temp_file)
+        # Test export to an in-memory text stream
+        import io
+        import json
+        buffer = io.StringIO()
+        with self.assertLogs('aws_cf_terraform_migrator.discovery', level='INFO') as logs:
+            self.engine.export_discovery_results(buffer)
+        
+        # Verify the stream received the JSON data
+        data = json.loads(buffer.getvalue())
+        
+        self.assertEqual(list(data['stacks']), ['id1'])
+        self.assertEqual(data['stacks']['id1']['stack_name'], 'stack1')
+        self.assertEqual(list(data['resources']), ['vpc-1'])
+        self.assertEqual(data['discovery_metadata']['summary']['total_resources'], 1)
+        self.assertEqual(data['discovery_metadata']['regions'], ['us-east-1'])
+        
+        # The log names the stream rather than printing its repr
+        self.assertIn('Discovery results exported to text stream', logs.output[-1])
     
     def test_filter_stacks_by_name(self):
         """Test stack filtering by name pattern"""
@@ -370,29 +361,26 @@ class TestDiscoveryEngine(unittest.TestCase):
     
     def test_error_handling(self):
         """Test error handling for AWS API failures"""
-        with patch('boto3.Session') as mock_session:
-            mock_client = Mock()
-            mock_session_instance = Mock()
-            mock_session.return_value = mock_session_instance
-            mock_session_instance.client.return_value = mock_client
-            
-            # Mock API error
-            from botocore.exceptions import ClientError
-            mock_client.list_stacks.side_effect = ClientError(
-                {'Error': {'Code': 'AccessDenied', 'Message': 'Access denied'}},
-                'ListStacks'
-            )
-            
-            # Should handle error gracefully
-            stacks = self.engine.discover_stacks('us-east-1')
-            self.assertEqual(len(stacks), 0)
+        mock_client = Mock()
+        self.mock_session.client.return_value = mock_client
+        
+        # Mock API error
+        mock_client.list_stacks.side_effect = ClientError(
+            {'Error': {'Code': 'AccessDenied', 'Message': 'Access denied'}},
+            'ListStacks'
+        )
+        
+        # Should handle error gracefully
+        stacks = self.engine.discover_stacks('us-east-1')
+        self.assertEqual(len(stacks), 0)
 
 
 class TestResourceFiltering(unittest.TestCase):
     """Test resource filtering and identification"""
     
-    def setUp(self):
-        self.engine = DiscoveryEngine(regions=['us-east-1'])
+    @classmethod
+    def setUpClass(cls):
+        cls.engine = DiscoveryEngine(regions=['us-east-1'])
     
     def test_identify_cloudformation_managed_resources(self):
         """Test identification of CloudFormation-managed resources"""
@@ -6,9 +6,11 @@ Unit tests for the module generator
 import unittest
 import sys
 import os
-import tempfile
-import shutil
+import functools
 from pathlib import Path
+from unittest.mock import patch, mock_open
+
+import pytest
 
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src'))
@@ -16,15 +18,48 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src'))
 from aws_cf_terraform_migrator.modules import ModuleGenerator, ModuleOrganizer, ModuleInfo, GenerationResult
 
 
+# Files every generated module and the root module contain with readme and versions on
+_EXPECTED_MODULE_FILES = frozenset({"main.tf", "variables.tf", "outputs.tf", "versions.tf", "README.md"})
+
+
+def setUpModule():
+    # Compile the module file templates before the first timed test
+    ModuleGenerator(organization_strategy="service_based")._warm_templates()
+
+
+# Every strategy's organizer is derived from this one and shares its lookup tables
+_ORGANIZER = ModuleOrganizer(strategy="service_based")
+
+
+@functools.lru_cache(maxsize=64)
+def _organize_cached(strategy, resources_key):
+    """Organize resources rebuilt from a hashable key; callers must not mutate the result"""
+    resources = {resource_id: dict(info) for resource_id, info in resources_key}
+    return _ORGANIZER.with_strategy(strategy).organize_resources(resources)
+
+
+def _organize(strategy, resources):
+    """Memoized ModuleOrganizer(strategy).organize_resources(resources)"""
+    # The key keeps the caller's insertion order, so the organizer sees the
+    # resources exactly as a direct call would
+    resources_key = tuple(
+        (resource_id, tuple(info.items()))
+        for resource_id, info in resources.items()
+    )
+    return _organize_cached(strategy, resources_key)
+
+
 class TestModuleOrganizer(unittest.TestCase):
     """Test the ModuleOrganizer class"""
     
-    def setUp(self):
-        self.organizer = ModuleOrganizer(strategy="service_based")
+    @classmethod
+    def setUpClass(cls):
+        cls.organizer = _ORGANIZER
     
-    def test_service_based_organization(self):
-        """Test service-based resource organization"""
-        resources = {
+    # (strategy, resources, expected module name -> resource ids it must hold)
+    ORGANIZATION_CASES = [
+        # Service-based: networking, storage and compute resources grouped
+        ('service_based', {
             'vpc-12345': {
                 'resource_type': 'AWS::EC2::VPC',
                 'resource_id': 'vpc-12345'
@@ -41,28 +76,13 @@ class TestModuleOrganizer(unittest.TestCase):
                 'resource_type': 'AWS::Lambda::Function',
                 'resource_id': 'function-def456'
             }
-        }
-        
-        modules = self.organizer.organize_resources(resources)
-        
-        # Should group networking resources together
-        self.assertIn('networking', modules)
-        self.assertIn('vpc-12345', modules['networking'])
-        self.assertIn('subnet-67890', modules['networking'])
-        
-        # Should group storage resources
-        self.assertIn('storage', modules)
-        self.assertIn('bucket-abc123', modules['storage'])
-        
-        # Should group compute resources
-        self.assertIn('compute', modules)
-        self.assertIn('function-def456', modules['compute'])
-    
-    def test_stack_based_organization(self):
-        """Test stack-based resource organization"""
-        organizer = ModuleOrganizer(strategy="stack_based")
-        
-        resources = {
+        }, {
+            'networking': ['vpc-12345', 'subnet-67890'],
+            'storage': ['bucket-abc123'],
+            'compute': ['function-def456']
+        }),
+        # Stack-based: grouped by stack name, independent resources separate
+        ('stack_based', {
             'vpc-12345': {
                 'resource_type': 'AWS::EC2::VPC',
                 'resource_id': 'vpc-12345',
@@ -78,26 +98,13 @@ class TestModuleOrganizer(unittest.TestCase):
                 'resource_id': 'vpc-independent',
                 'stack_name': None
             }
-        }
-        
-        modules = organizer.organize_resources(resources)
-        
-        # Should group by stack name
-        self.assertIn('networking_stack', modules)
-        self.assertIn('vpc-12345', modules['networking_stack'])
-        
-        self.assertIn('storage_stack', modules)
-        self.assertIn('bucket-abc123', modules['storage_stack'])
-        
-        # Independent resources should go to separate module
-        self.assertIn('independent_resources', modules)
-        self.assertIn('independent-vpc', modules['independent_resources'])
-    
-    def test_lifecycle_based_organization(self):
-        """Test lifecycle-based resource organization"""
-        organizer = ModuleOrganizer(strategy="lifecycle_based")
-        
-        resources = {
+        }, {
+            'networking_stack': ['vpc-12345'],
+            'storage_stack': ['bucket-abc123'],
+            'independent_resources': ['independent-vpc']
+        }),
+        # Lifecycle-based: shared infrastructure, application and data
+        ('lifecycle_based', {
             'vpc-12345': {
                 'resource_type': 'AWS::EC2::VPC',
                 'resource_id': 'vpc-12345'
@@ -110,39 +117,64 @@ class TestModuleOrganizer(unittest.TestCase):
                 'resource_type': 'AWS::RDS::DBInstance',
                 'resource_id': 'database-abc123'
             }
+        }, {
+            'shared_infrastructure': ['vpc-12345'],
+            'application_resources': ['instance-67890'],
+            'data_resources': ['database-abc123']
+        }),
+    ]
+    
+    # A large stack that should be subdivided: more than 20 resources
+    _HYBRID_RESOURCES = {
+        f'vpc-{i}': {
+            'resource_type': 'AWS::EC2::VPC',
+            'resource_id': f'vpc-{i}',
+            'stack_name': 'large-stack'
         }
-        
-        modules = organizer.organize_resources(resources)
-        
-        # Should group by lifecycle
-        self.assertIn('shared_infrastructure', modules)
-        self.assertIn('vpc-12345', modules['shared_infrastructure'])
-        
-        self.assertIn('application_resources', modules)
-        self.assertIn('instance-67890', modules['application_resources'])
-        
-        self.assertIn('data_resources', modules)
-        self.assertIn('database-abc123', modules['data_resources'])
+        for i in range(25)
+    }
+    
+    def test_organization_strategies(self):
+        """Test service, stack and lifecycle based resource organization"""
+        for strategy, resources, expected_modules in self.ORGANIZATION_CASES:
+            with self.subTest(strategy=strategy):
+                modules = _organize(strategy, resources)
+                
+                for module_name, resource_ids in expected_modules.items():
+                    self.assertIn(module_name, modules)
+                    for resource_id in resource_ids:
+                        self.assertIn(resource_id, modules[module_name])
     
     def test_hybrid_organization(self):
         """Test hybrid organization strategy"""
-        organizer = ModuleOrganizer(strategy="hybrid")
-        
-        # Create a large stack that should be subdivided
-        resources = {}
-        for i in range(25):  # More than 20 resources
-            resources[f'vpc-{i}'] = {
-                'resource_type': 'AWS::EC2::VPC',
-                'resource_id': f'vpc-{i}',
-                'stack_name': 'large-stack'
-            }
-        
-        modules = organizer.organize_resources(resources)
+        modules = _organize("hybrid", self._HYBRID_RESOURCES)
         
         # Should subdivide large stack by service
         self.assertIn('large_stack_networking', modules)
         self.assertEqual(len(modules['large_stack_networking']), 25)
     
+    def test_type_to_group_lookup(self):
+        """Test the resource type to service group lookup table"""
+        type_to_group = self.organizer.type_to_group
+        
+        self.assertEqual(type_to_group['AWS::EC2::VPC'], 'networking')
+        self.assertEqual(type_to_group['AWS::S3::Bucket'], 'storage')
+        self.assertEqual(type_to_group['AWS::Lambda::Function'], 'compute')
+        self.assertNotIn('AWS::Custom::Thing', type_to_group)
+        
+        # Every grouped type is in the table exactly once
+        grouped = sum(len(types) for types in self.organizer.service_groups.values())
+        self.assertEqual(len(type_to_group), grouped)
+    
+    def test_with_strategy(self):
+        """Test deriving an organizer for another strategy"""
+        stack_organizer = self.organizer.with_strategy("stack_based")
+        
+        self.assertEqual(stack_organizer.strategy, "stack_based")
+        self.assertEqual(self.organizer.strategy, "service_based")
+        self.assertIs(stack_organizer.type_to_group, self.organizer.type_to_group)
+        self.assertIs(stack_organizer.service_groups, self.organizer.service_groups)
+    
     def test_sanitize_module_name(self):
         """Test module name sanitization"""
         test_cases = [
@@ -159,24 +191,52 @@ class TestModuleOrganizer(unittest.TestCase):
             self.assertEqual(result, expected, f"Failed for input: {input_name}")
 
 
-class TestModuleGenerator(unittest.TestCase):
+@pytest.fixture(scope="session")
+def generator():
+    """Service-based generator shared by the session; it keeps no per-run state"""
+    return ModuleGenerator(
+        organization_strategy="service_based",
+        include_readme=True,
+        include_versions_tf=True
+    )
+
+
+@pytest.fixture(scope="session")
+def minimal_generator():
+    """Service-based generator for tests that only check which modules exist"""
+    return ModuleGenerator(
+        organization_strategy="service_based",
+        include_readme=False,
+        include_versions_tf=False
+    )
+
+
+@pytest.fixture(scope="session")
+def stack_generator():
+    """Stack-based generator for tests that only check which modules exist"""
+    return ModuleGenerator(
+        organization_strategy="stack_based",
+        include_readme=False,
+        include_versions_tf=False
+    )
+
+
+@pytest.fixture
+def output_path(fs):
+    """Output directory on pyfakefs' in-memory filesystem, discarded after the test"""
+    return Path("/fake/out")
+
+
+def _read_all(directory, names):
+    """Read the named files in directory, returning their text keyed by name"""
+    return {name: (directory / name).read_bytes().decode() for name in names}
+
+
+@pytest.mark.parallel_safe
+class TestModuleGenerator:
     """Test the ModuleGenerator class"""
     
-    def setUp(self):
-        self.generator = ModuleGenerator(
-            organization_strategy="service_based",
-            include_readme=True,
-            include_versions_tf=True
-        )
-        
-        # Create temporary directory for testing
-        self.temp_dir = tempfile.mkdtemp()
-    
-    def tearDown(self):
-        # Clean up temporary directory
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-    
-    def test_generate_single_module(self):
+    def test_generate_single_module(self, generator, output_path):
         """Test generation of a single module"""
         resources = {
             'vpc-12345': {
@@ -208,32 +268,29 @@ class TestModuleGenerator(unittest.TestCase):
             }
         }
         
-        result = self.generator.generate_modules(
+        result = generator.generate_modules(
             converted_resources=resources,
             discovery_resources={},
-            output_dir=self.temp_dir
+            output_dir=str(output_path)
         )
         
-        self.assertIsInstance(result, GenerationResult)
-        self.assertTrue(result.modules)
-        self.assertGreater(result.total_files, 0)
+        assert isinstance(result, GenerationResult)
+        assert result.modules
+        assert result.total_files > 0
         
         # Check that module directory was created
-        modules_dir = Path(self.temp_dir) / "modules"
-        self.assertTrue(modules_dir.exists())
+        modules_dir = output_path / "modules"
+        assert modules_dir.exists()
         
         # Check that networking module was created (VPC goes to networking)
         networking_module = modules_dir / "networking"
-        self.assertTrue(networking_module.exists())
-        
-        # Check that required files were created
-        self.assertTrue((networking_module / "main.tf").exists())
-        self.assertTrue((networking_module / "variables.tf").exists())
-        self.assertTrue((networking_module / "outputs.tf").exists())
-        self.assertTrue((networking_module / "versions.tf").exists())
-        self.assertTrue((networking_module / "README.md").exists())
+        assert networking_module.exists()
+        
+        # Check that required files were created, listing the directory once
+        names = {entry.name for entry in os.scandir(networking_module)}
+        assert _EXPECTED_MODULE_FILES <= names
     
-    def test_generate_multiple_modules(self):
+    def test_generate_multiple_modules(self, minimal_generator, output_path):
         """Test generation of multiple modules"""
         resources = {
             'vpc-12345': {
@@ -264,21 +321,21 @@ class TestModuleGenerator(unittest.TestCase):
             }
         }
         
-        result = self.generator.generate_modules(
+        result = minimal_generator.generate_modules(
             converted_resources=resources,
             discovery_resources={},
-            output_dir=self.temp_dir
+            output_dir=str(output_path)
         )
         
         # Should create multiple modules
-        self.assertGreaterEqual(len(result.modules), 2)
+        assert len(result.modules) >= 2
         
         # Check that both networking and storage modules exist
-        modules_dir = Path(self.temp_dir) / "modules"
-        self.assertTrue((modules_dir / "networking").exists())
-        self.assertTrue((modules_dir / "storage").exists())
+        modules_dir = output_path / "modules"
+        assert (modules_dir / "networking").exists()
+        assert (modules_dir / "storage").exists()
     
-    def test_generate_root_module(self):
+    def test_generate_root_module(self, generator, output_path):
         """Test generation of root module"""
         resources = {
             'vpc-12345': {
@@ -296,24 +353,20 @@ class TestModuleGenerator(unittest.TestCase):
             }
         }
         
-        result = self.generator.generate_modules(
+        result = generator.generate_modules(
             converted_resources=resources,
             discovery_resources={},
-            output_dir=self.temp_dir
+            output_dir=str(output_path)
         )
         
         # Should create root module
-        self.assertIsNotNone(result.root_module)
+        assert result.root_module is not None
         
         # Check root module files
-        output_path = Path(self.temp_dir)
-        self.assertTrue((output_path / "main.tf").exists())
-        self.assertTrue((output_path / "variables.tf").exists())
-        self.assertTrue((output_path / "outputs.tf").exists())
-        self.assertTrue((output_path / "versions.tf").exists())
-        self.assertTrue((output_path / "README.md").exists())
+        names = {entry.name for entry in os.scandir(output_path)}
+        assert _EXPECTED_MODULE_FILES <= names
     
-    def test_module_file_content(self):
+    def test_module_file_content(self, generator, output_path):
         """Test content of generated module files"""
         resources = {
             'vpc-12345': {
@@ -345,31 +398,32 @@ class TestModuleGenerator(unittest.TestCase):
             }
         }
         
-        result = self.generator.generate_modules(
+        result = generator.generate_modules(
             converted_resources=resources,
             discovery_resources={},
-            output_dir=self.temp_dir
+            output_dir=str(output_path)
         )
         
-        # Check main.tf content
-        networking_module = Path(self.temp_dir) / "modules" / "networking"
-        main_tf_content = (networking_module / "main.tf").read_text()
+        networking_module = output_path / "modules" / "networking"
+        contents = _read_all(networking_module, ["main.tf", "variables.tf", "outputs.tf"])
         
-        self.assertIn('resource "aws_vpc" "main_vpc"', main_tf_content)
-        self.assertIn('cidr_block', main_tf_content)
-        self.assertIn('enable_dns_hostnames', main_tf_content)
+        # Check main.tf content
+        main_tf_content = contents["main.tf"]
+        assert 'resource "aws_vpc" "main_vpc"' in main_tf_content
+        assert 'cidr_block' in main_tf_content
+        assert 'enable_dns_hostnames' in main_tf_content
         
         # Check variables.tf content
-        variables_tf_content = (networking_module / "variables.tf").read_text()
-        self.assertIn('variable "vpc_cidr"', variables_tf_content)
-        self.assertIn('VPC CIDR block', variables_tf_content)
+        variables_tf_content = contents["variables.tf"]
+        assert 'variable "vpc_cidr"' in variables_tf_content
+        assert 'VPC CIDR block' in variables_tf_content
         
         # Check outputs.tf content
-        outputs_tf_content = (networking_module / "outputs.tf").read_text()
-        self.assertIn('output "vpc_id"', outputs_tf_content)
-        self.assertIn('aws_vpc.main_vpc.id', outputs_tf_content)
+        outputs_tf_content = contents["outputs.tf"]
+        assert 'output "vpc_id"' in outputs_tf_content
+        assert 'aws_vpc.main_vpc.id' in outputs_tf_content
     
-    def test_analyze_module_interfaces(self):
+    def test_analyze_module_interfaces(self, generator):
         """Test analysis of module interfaces for variables and outputs"""
         module_resources = {
             'aws_vpc': {
@@ -384,20 +438,33 @@ class TestModuleGenerator(unittest.TestCase):
             }
         }
         
-        variables, outputs = self.generator._analyze_module_interfaces(
+        variables, outputs = generator._analyze_module_interfaces(
             module_resources, 'test_module'
         )
         
         # Should generate common variables
-        self.assertIn('tags', variables)
-        self.assertEqual(variables['tags']['type'], 'map(string)')
+        assert 'tags' in variables
+        assert variables['tags']['type'] == 'map(string)'
         
         # Should generate outputs for VPC and S3 bucket
-        self.assertIn('main_vpc_id', outputs)
-        self.assertIn('main_bucket_name', outputs)
-        self.assertIn('main_bucket_arn', outputs)
+        assert 'main_vpc_id' in outputs
+        assert 'main_bucket_name' in outputs
+        assert 'main_bucket_arn' in outputs
+        
+        # Changing a returned nested dict must not affect later results
+        repeat_variables, repeat_outputs = generator._analyze_module_interfaces(
+            module_resources, 'other_module'
+        )
+        assert (repeat_variables, repeat_outputs) == (variables, outputs)
+        repeat_variables['tags']['default']['Team'] = 'platform'
+        repeat_outputs['main_bucket_arn']['value'] = 'changed'
+        fresh_variables, fresh_outputs = generator._analyze_module_interfaces(
+            module_resources, 'test_module'
+        )
+        assert fresh_variables['tags']['default'] == {}
+        assert fresh_outputs['main_bucket_arn']['value'] == 'aws_s3_bucket.main_bucket.arn'
     
-    def test_template_rendering(self):
+    def test_template_rendering(self, generator, output_path):
         """Test Terraform template rendering"""
         # Test main.tf template
         module_resources = {
@@ -417,39 +484,79 @@ class TestModuleGenerator(unittest.TestCase):
         }
         
         # Create temporary module directory
-        module_dir = Path(self.temp_dir) / "test_module"
+        module_dir = output_path / "test_module"
         module_dir.mkdir(parents=True)
         
         # Test main.tf generation
-        self.generator._write_main_tf(module_dir, "test_module", module_resources, locals_dict)
+        generator._write_main_tf(module_dir, "test_module", module_resources, locals_dict)
         
-        main_tf_content = (module_dir / "main.tf").read_text()
+        main_tf_content = _read_all(module_dir, ["main.tf"])["main.tf"]
         
         # Should contain resource definition
-        self.assertIn('resource "aws_vpc" "test_vpc"', main_tf_content)
-        self.assertIn('cidr_block = "10.0.0.0/16"', main_tf_content)
-        self.assertIn('enable_dns_hostnames = true', main_tf_content)
+        assert 'resource "aws_vpc" "test_vpc"' in main_tf_content
+        assert 'cidr_block = "10.0.0.0/16"' in main_tf_content
+        assert 'enable_dns_hostnames = true' in main_tf_content
         
         # Should contain locals
-        self.assertIn('locals {', main_tf_content)
-        self.assertIn('common_tags', main_tf_content)
+        assert 'locals {' in main_tf_content
+        assert 'common_tags' in main_tf_content
+    
+    def test_main_tf_single_write(self, generator):
+        """Test that main.tf is rendered in full and written with one call"""
+        module_resources = {
+            'aws_vpc': {
+                f'vpc_{i}': {'cidr_block': f'10.{i}.0.0/16'} for i in range(25)
+            }
+        }
+        
+        with patch('builtins.open', mock_open()) as mocked_open:
+            generator._write_main_tf(Path("/fake/out"), "test_module", module_resources, {})
+        
+        mocked_open.assert_called_once_with(Path("/fake/out") / "main.tf", 'w')
+        assert mocked_open().write.call_count == 1
+    
+    def test_template_override(self, generator, output_path):
+        """Test that subclass and instance template overrides are rendered"""
+        # Compile the default templates first, as setUpModule does
+        generator._warm_templates()
+        
+        class CustomGenerator(ModuleGenerator):
+            VERSIONS_TF_TEMPLATE = "# custom versions for {{ module_name }}\n"
+        
+        custom = CustomGenerator()
+        custom.README_TEMPLATE = "# custom readme for {{ module_name }}\n"
+        module_dir = output_path / "custom_module"
+        module_dir.mkdir(parents=True)
+        
+        custom._write_versions_tf(module_dir, "custom_module")
+        custom._write_readme_md(module_dir, "custom_module", {}, {}, {}, [])
+        generator._write_versions_tf(module_dir, "default_module")
+        
+        contents = _read_all(module_dir, ["README.md", "versions.tf"])
+        assert contents["README.md"] == "# custom readme for custom_module"
+        assert "custom versions" not in contents["versions.tf"]
+        assert "default_module" in contents["versions.tf"]
+        
+        custom._write_versions_tf(module_dir, "custom_module")
+        assert _read_all(module_dir, ["versions.tf"])["versions.tf"] == "# custom versions for custom_module"
     
-    def test_error_handling(self):
+    @pytest.mark.usefixtures("fs")
+    def test_error_handling(self, generator):
         """Test error handling in module generation"""
         # Test with invalid output directory
         invalid_dir = "/invalid/path/that/does/not/exist"
         
-        result = self.generator.generate_modules(
+        result = generator.generate_modules(
             converted_resources={},
             discovery_resources={},
             output_dir=invalid_dir
         )
         
         # Should handle error gracefully
-        self.assertFalse(result.modules)
-        self.assertTrue(len(result.errors) > 0)
+        assert not result.modules
+        assert len(result.errors) > 0
     
-    def test_module_organization_strategies(self):
+    def test_module_organization_strategies(self, minimal_generator, stack_generator, output_path):
         """Test different module organization strategies"""
         resources = {
             'vpc-1': {
@@ -467,28 +574,26 @@ class TestModuleGenerator(unittest.TestCase):
         }
         
         # Test service-based strategy
-        service_generator = ModuleGenerator(organization_strategy="service_based")
-        service_result = service_generator.generate_modules(
+        service_result = minimal_generator.generate_modules(
             converted_resources=resources,
             discovery_resources={},
-            output_dir=os.path.join(self.temp_dir, "service")
+            output_dir=str(output_path / "service")
         )
         
         # Should organize by service
-        self.assertIn('networking', service_result.modules)
-        self.assertIn('storage', service_result.modules)
+        assert 'networking' in service_result.modules
+        assert 'storage' in service_result.modules
         
         # Test stack-based strategy
-        stack_generator = ModuleGenerator(organization_strategy="stack_based")
         stack_result = stack_generator.generate_modules(
             converted_resources=resources,
             discovery_resources={},
-            output_dir=os.path.join(self.temp_dir, "stack")
+            output_dir=str(output_path / "stack")
         )
         
         # Should organize by stack
-        self.assertIn('network_stack', stack_result.modules)
-        self.assertIn('storage_stack', stack_result.modules)
+        assert 'network_stack' in stack_result.modules
+        assert 'storage_stack' in stack_result.modules
 
 
 class TestModuleInfo(unittest.TestCase):
@@ -536,5 +641,5 @@ class TestGenerationResult(unittest.TestCase):
 
 
 if __name__ == '__main__':
-    unittest.main()
+    sys.exit(pytest.main([__file__]))
 
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for the sample CloudFormation template fixture helpers
+"""
+
+import pytest
+
+from test.fixtures import sample_cloudformation_templates as templates
+from test.fixtures.sample_cloudformation_templates import (
+    ALL_TEMPLATES, derive, refs_of, register_derivation, resources_of_type,
+    template_digest, template_index, validate_template
+)
+
+
+@register_derivation
+def _count_resources(template, resource_type):
+    """Count the resources of one type in a template"""
+    return sum(1 for resource in template['Resources'].values() if resource['Type'] == resource_type)
+
+
+@pytest.mark.parametrize("name", list(ALL_TEMPLATES))
+def test_validate_template(name, template_validator):
+    """Test that every fixture template passes the structural schema"""
+    assert validate_template(name) == []
+    assert template_validator.is_valid(ALL_TEMPLATES[name])
+
+
+def test_validate_template_missing_resources(monkeypatch):
+    """Test that a template without Resources is reported"""
+    monkeypatch.setattr(templates, "get_template", lambda name: {"AWSTemplateFormatVersion": "2010-09-09"})
+    
+    errors = validate_template("broken")
+    
+    assert len(errors) == 1
+    assert "'Resources' is a required property" in errors[0]
+
+
+def test_resources_of_type():
+    """Test looking up logical IDs by resource type"""
+    assert resources_of_type('simple_vpc', 'AWS::EC2::Subnet') == ('MySubnet',)
+    assert resources_of_type('simple_vpc', 'AWS::S3::Bucket') == ()
+
+
+def test_template_index_by_type():
+    """Test that the index lists every resource under its type"""
+    index = template_index('simple_vpc')
+    
+    indexed = sorted(logical_id for ids in index['by_type'].values() for logical_id in ids)
+    assert indexed == sorted(templates.get_template('simple_vpc')['Resources'])
+    assert template_index('simple_vpc') is index
+
+
+def test_refs_of():
+    """Test that refs_of returns only the resources a resource references"""
+    refs = refs_of('complex_web_app', 'ApplicationLoadBalancer')
+    
+    assert refs == {'PublicSubnet1', 'PublicSubnet2', 'ALBSecurityGroup'}
+
+
+def test_refs_of_excludes_parameters():
+    """Test that references to parameters are left out"""
+    parameters = set(templates.get_template('complex_web_app')['Parameters'])
+    
+    for logical_id, refs in template_index('complex_web_app')['refs'].items():
+        assert not refs & parameters, logical_id
+
+
+def test_template_digest_stable():
+    """Test that a template's digest is the same on every call"""
+    digest = template_digest('simple_vpc')
+    
+    assert template_digest.__wrapped__('simple_vpc') == digest
+    assert template_digest('complex_web_app') != digest
+
+
+def test_template_digest_changes_with_content(monkeypatch):
+    """Test that changing a template's content changes its digest"""
+    digest = template_digest('simple_vpc')
+    changed = dict(templates.get_template('simple_vpc'), Description='Changed')
+    monkeypatch.setattr(templates, "get_template", lambda name: changed)
+    
+    assert template_digest.__wrapped__('simple_vpc') != digest
+
+
+def test_derive_cached():
+    """Test that repeating a derivation reuses the cached result"""
+    first = derive('simple_vpc', _count_resources, 'AWS::EC2::Subnet')
+    hits = templates._derive_cached.cache_info().hits
+    
+    assert derive('simple_vpc', _count_resources, 'AWS::EC2::Subnet') == first == 1
+    assert templates._derive_cached.cache_info().hits == hits + 1
+
+
+def test_derive_unregistered_transform():
+    """Test that derive rejects a transform that was never registered"""
+    def count_resources(template):
+        return len(template['Resources'])
+    
+    with pytest.raises(ValueError, match="is not registered"):
+        derive('simple_vpc', count_resources)
+
+
+def test_templates_share_no_fragments():
+    """Test that equal fragments of different templates are separate objects"""
+    vpc_subnet = templates.get_template('simple_vpc')['Resources']['MySubnet']
+    web_subnet = templates.get_template('complex_web_app')['Resources']['PublicSubnet1']
+    
+    assert vpc_subnet['Properties']['AvailabilityZone'] == web_subnet['Properties']['AvailabilityZone']
+    assert vpc_subnet['Properties']['AvailabilityZone'] is not web_subnet['Properties']['AvailabilityZone']
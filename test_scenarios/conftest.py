@@ -0,0 +1,38 @@
+"""
+Shared fixtures for running the converter scenarios under pytest
+
+Scenarios are independent of each other, so they can be spread over cores
+with ``python -m pytest -n auto --dist=loadgroup test_scenarios``; loadgroup
+keeps every check of one scenario, and so its session fixtures, on one worker.
+"""
+
+import pytest
+
+from test_runner import SCENARIOS, TestRunner, create_scenario
+
+
+@pytest.fixture(scope="session")
+def runner():
+    """TestRunner whose per-scenario checks the tests call directly"""
+    return TestRunner()
+
+
+@pytest.fixture(
+    scope="session",
+    params=[pytest.param(name, marks=pytest.mark.xdist_group(name)) for name in SCENARIOS]
+)
+def scenario(request):
+    """Each registered scenario in turn"""
+    return create_scenario(request.param)
+
+
+@pytest.fixture(scope="session")
+def scenario_dir(scenario, tmp_path_factory):
+    """Worker-local output directory shared by the checks of one scenario"""
+    return tmp_path_factory.mktemp(f"cf2tf_test_{scenario.name}_")
+
+
+@pytest.fixture(scope="session")
+def orchestration_result(runner, scenario, scenario_dir):
+    """Result of the end-to-end orchestration run, which the validation reads back"""
+    return runner._test_orchestration(scenario, str(scenario_dir))
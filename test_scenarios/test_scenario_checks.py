@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Run each TestRunner scenario check as a pytest test
+"""
+
+import sys
+
+import pytest
+
+
+def test_conversion_engine(runner, scenario):
+    """Test the conversion engine on the scenario template"""
+    result = runner._test_conversion_engine(scenario)
+    assert result['success'], result['errors']
+
+
+def test_module_generation(runner, scenario, tmp_path):
+    """Test module generation from the converted scenario template"""
+    result = runner._test_module_generation(scenario, str(tmp_path))
+    assert result['success'], result['errors']
+
+
+def test_orchestration(orchestration_result):
+    """Test end-to-end orchestration of the scenario stack"""
+    assert orchestration_result['success'], orchestration_result['errors']
+
+
+def test_terraform_validation(runner, scenario, scenario_dir, orchestration_result):
+    """Test the Terraform written by the orchestration run"""
+    result = runner._test_terraform_validation(scenario, str(scenario_dir))
+    assert result['success'], result['errors']
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))